@@ -17,7 +17,10 @@ def main():
     get_check_and_save_page_uuids(args.data_dirpath)
     for dirname in dd.utils.DATA_DIRNAMES:
         dirpath = args.data_dirpath.joinpath(dirname)
-        dd.utils.make_gztar_archive_from_dir(dirpath)
+        if args.n_workers == 1:
+            dd.utils.make_gztar_archive_from_dir(dirpath)
+        else:
+            dd.utils.make_gztar_archive_from_dir_parallel(dirpath, n_workers=args.n_workers)
 
 
 def add_and_parse_args() -> argparse.Namespace:
@@ -34,6 +37,11 @@ def add_and_parse_args() -> argparse.Namespace:
         "at `data_dirpath/html` and `data_dirpath/meta`, respectively, and to which "
         "corresponding gztar archives are to be stored",
     )
+    parser.add_argument(
+        "--n_workers", type=int, default=1,
+        help="number of threads used to compress archives; if 1, archives are made "
+        "serially via `shutil`; if 0, use as many threads as there are CPUs",
+    )
     args = parser.parse_args()
     args.data_dirpath = args.data_dirpath.resolve()
     return args
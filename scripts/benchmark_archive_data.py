@@ -0,0 +1,104 @@
+import argparse
+import gzip
+import logging
+import pathlib
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict
+
+import dragnet_data as dd
+
+logging.basicConfig(level=logging.WARNING)
+
+PKG_ROOT = dd.utils.get_pkg_root()
+
+
+def main():
+    args = add_and_parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_dirpath = pathlib.Path(tmpdir)
+        src_dirpath = tmp_dirpath.joinpath(args.dirpath.name)
+        shutil.copytree(args.dirpath, src_dirpath)
+        src_nbytes = sum(path.stat().st_size for path in src_dirpath.rglob("*"))
+        print(f"benchmarking archives of {args.dirpath} ({src_nbytes / 1e6:.1f} MB)")
+        methods: Dict[str, Dict[str, Callable]] = {
+            "shutil": {
+                "pack": dd.utils.make_gztar_archive_from_dir,
+                "unpack": dd.utils.unpack_gztar_archive_to_dir,
+            },
+            "parallel": {
+                "pack": lambda path: dd.utils.make_gztar_archive_from_dir_parallel(
+                    path, n_workers=args.n_workers,
+                ),
+                "unpack": lambda path: dd.utils.unpack_gztar_archive_to_dir_parallel(
+                    path, n_workers=args.n_workers,
+                ),
+            },
+        }
+        for name, funcs in methods.items():
+            method_dirpath = tmp_dirpath.joinpath(name)
+            method_dirpath.mkdir()
+            dirpath = method_dirpath.joinpath(src_dirpath.name)
+            shutil.copytree(src_dirpath, dirpath)
+            pack_times, unpack_times = [], []
+            for _ in range(args.n_repeats):
+                start = time.perf_counter()
+                fpath = funcs["pack"](dirpath)
+                pack_times.append(time.perf_counter() - start)
+                shutil.rmtree(dirpath)
+                start = time.perf_counter()
+                funcs["unpack"](fpath)
+                unpack_times.append(time.perf_counter() - start)
+            # sanity-check: output must be a valid gzip stream that stdlib tools can read
+            with gzip.open(fpath, mode="rb") as f:
+                while f.read(1024 * 1024):
+                    pass
+            check_dirs_match(src_dirpath, dirpath)
+            print(
+                f"{name:>10}: pack {min(pack_times):.3f}s, unpack {min(unpack_times):.3f}s "
+                f"(best of {args.n_repeats}), size {fpath.stat().st_size / 1e6:.1f} MB"
+            )
+
+
+def add_and_parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark making and unpacking gztar archives of a data directory "
+        "serially via `shutil` vs. in parallel via a thread pool.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--dirpath",
+        type=pathlib.Path,
+        default=PKG_ROOT.parents[1].joinpath("data", "html"),
+        help="path to directory on disk whose contents are to be archived; "
+        "it's copied into a temporary directory first, and left untouched",
+    )
+    parser.add_argument(
+        "--n_workers", type=int, default=0,
+        help="number of threads used by the parallel method; "
+        "if 0, use as many threads as there are CPUs",
+    )
+    parser.add_argument(
+        "--n_repeats", type=int, default=3,
+        help="number of times to repeat each method, of which the best time is reported",
+    )
+    args = parser.parse_args()
+    args.dirpath = args.dirpath.resolve()
+    return args
+
+
+def check_dirs_match(dirpath1: pathlib.Path, dirpath2: pathlib.Path):
+    fpaths1 = sorted(path.relative_to(dirpath1) for path in dirpath1.rglob("*"))
+    fpaths2 = sorted(path.relative_to(dirpath2) for path in dirpath2.rglob("*"))
+    if fpaths1 != fpaths2:
+        raise ValueError(f"contents of {dirpath1} and {dirpath2} don't match")
+    for fpath in fpaths1:
+        path1 = dirpath1.joinpath(fpath)
+        if path1.is_file() and path1.read_bytes() != dirpath2.joinpath(fpath).read_bytes():
+            raise ValueError(f"contents of {fpath} don't match after round-trip")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import argparse
+import logging
+import pathlib
+import sys
+
+import dragnet_data as dd
+
+logging.basicConfig(level=logging.INFO)
+
+PKG_ROOT = dd.utils.get_pkg_root()
+
+
+def main():
+    args = add_and_parse_args()
+    args.data_dirpath.joinpath("meta").mkdir(parents=True, exist_ok=True)
+    metadata_cache = dd.cache.MetadataCache(
+        args.cache_dirpath, max_nbytes=args.cache_max_nbytes,
+    )
+    html_fpaths = sorted(args.data_dirpath.joinpath("html").glob("*.html"))
+    n_pages = len(html_fpaths)
+    for idx, html_fpath in enumerate(html_fpaths):
+        logging.debug("extracting data for page %s / %s", idx, n_pages)
+        # read html as-is, line endings and all, just as it was fetched
+        with html_fpath.open(mode="rt", newline="") as f:
+            html = f.read()
+        try:
+            meta = dd.html.get_data_from_html(html, metadata_cache=metadata_cache)
+        except Exception:
+            logging.error("unable to extract data from HTML for %s", html_fpath)
+            continue
+        meta_fpath = args.data_dirpath.joinpath("meta", f"{html_fpath.stem}.toml")
+        # page ids and fallback urls (from the final response) were assigned at
+        # fetch time, so keep them fixed
+        meta["id"] = html_fpath.stem
+        if "url" not in meta and meta_fpath.exists():
+            meta["url"] = dd.utils.load_toml_data(meta_fpath).get("url", "")
+        for field in ("url", "title", "dt_published", "text"):
+            _ = meta.setdefault(field, "")
+        meta = {field: meta.get(field) for field in dd.utils.META_FIELDS}
+        if meta_fpath.exists() and args.force is False:
+            logging.warning(
+                "%s already exists and `force` is False; data will not be saved",
+                meta_fpath,
+            )
+        else:
+            dd.utils.save_toml_data(meta, meta_fpath)
+    logging.info(
+        "extracted data for %s pages (%s metadata cache hits, %s misses)",
+        n_pages, metadata_cache.n_hits, metadata_cache.n_misses,
+    )
+
+
+def add_and_parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Re-extract draft metadata from already-fetched HTML documents, "
+        "reusing cached raw structured metadata to skip HTML parsing when possible.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--data_dirpath",
+        type=pathlib.Path,
+        default=PKG_ROOT.parents[1].joinpath("data", "TODO"),
+        help="path to directory on disk under which HTML data is stored at "
+        "`data_dirpath/html` and meta data is to be stored at `data_dirpath/meta`",
+    )
+    parser.add_argument(
+        "--cache_dirpath",
+        type=pathlib.Path,
+        default=PKG_ROOT.parents[1].joinpath(".cache", "metadata"),
+        help="path to directory on disk where raw structured metadata extracted from "
+        "HTML is cached, so that re-extracting data from the same HTML skips parsing",
+    )
+    parser.add_argument(
+        "--cache_max_nbytes", type=int, default=2 * 1024 ** 3,
+        help="maximum size of the metadata cache in bytes, beyond which "
+        "least-recently-used entries are evicted",
+    )
+    parser.add_argument(
+        "--force", action="store_true", default=False,
+        help="if specified, save meta data under `data_dirpath` even if files "
+        "already exist in those locations; otherwise, just log a warning",
+    )
+    args = parser.parse_args()
+    args.data_dirpath = args.data_dirpath.resolve()
+    args.cache_dirpath = args.cache_dirpath.resolve()
+    return args
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,12 @@
 import argparse
+import collections
+import heapq
 import logging
 import pathlib
 import random
 import sys
-from typing import Any, Dict, Optional, Tuple, Union
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import httpx
 
@@ -31,13 +34,65 @@ def main():
     rss_pages = random.sample(rss_pages, k=len(rss_pages))
     # fetch html and re-extract base metadata, plus text if available
     n_pages = len(rss_pages)
+    metadata_cache = dd.cache.MetadataCache(
+        args.cache_dirpath, max_nbytes=args.cache_max_nbytes,
+    )
+    host_tracker = dd.hosts.HostTracker(
+        max_retries=args.max_retries,
+        backoff_base=args.backoff_base,
+        backoff_max=args.backoff_max,
+        failure_threshold=args.failure_threshold,
+        cooldown=args.cooldown,
+    )
+    pages_queue = collections.deque(rss_pages)
+    # pages whose hosts are (temporarily) unavailable get deferred, once, until their
+    # host's circuit breaker lets a trial request through; ordered by that time
+    deferred_pages: List[Tuple[float, int, Dict[str, Any]]] = []
+    n_deferred = 0
     with httpx.Client(timeout=args.http_timeout) as client:
-        for idx, rss_page in enumerate(rss_pages):
-            logging.info("getting data for page %s / %s", idx, n_pages)
-            headers = {"user-agent": random.choice(USER_AGENTS)}
-            data = get_page_html_and_meta_data(
-                rss_page["url"], client=client, headers=headers,
+        while pages_queue or deferred_pages:
+            now = time.monotonic()
+            if deferred_pages and (not pages_queue or deferred_pages[0][0] <= now):
+                retry_at, _, rss_page = heapq.heappop(deferred_pages)
+                is_deferred = True
+                if retry_at - now > args.max_deferral_wait:
+                    logging.warning(
+                        "host of %s is unavailable for another %.1fs; skipping it",
+                        rss_page["url"], retry_at - now,
+                    )
+                    host_tracker.record_skipped(rss_page["url"])
+                    continue
+                elif retry_at > now:
+                    logging.info(
+                        "waiting %.1fs for host of deferred %s to become available",
+                        retry_at - now, rss_page["url"],
+                    )
+                    time.sleep(retry_at - now)
+            else:
+                rss_page = pages_queue.popleft()
+                is_deferred = False
+            logging.info(
+                "getting data for page %s / %s",
+                n_pages - len(pages_queue) - len(deferred_pages), n_pages,
             )
+            headers = {"user-agent": random.choice(USER_AGENTS)}
+            try:
+                data = get_page_html_and_meta_data(
+                    rss_page["url"],
+                    client=client,
+                    metadata_cache=metadata_cache,
+                    host_tracker=host_tracker,
+                    headers=headers,
+                )
+            except dd.hosts.HostUnavailableError as exc:
+                if is_deferred:
+                    logging.warning("%s; skipping %s", exc, rss_page["url"])
+                    host_tracker.record_skipped(rss_page["url"])
+                else:
+                    logging.info("%s; deferring %s", exc, rss_page["url"])
+                    heapq.heappush(deferred_pages, (exc.retry_at, n_deferred, rss_page))
+                    n_deferred += 1
+                continue
             if data is None:
                 continue
             else:
@@ -46,6 +101,7 @@ def main():
                 meta_fpath = args.data_dirpath.joinpath("meta", f"{meta['id']}.toml")
                 save_page_data_or_log(html, html_fpath, args.force)
                 save_page_data_or_log(meta, meta_fpath, args.force)
+    host_tracker.log_report()
 
 
 def add_and_parse_args() -> argparse.Namespace:
@@ -72,6 +128,49 @@ def add_and_parse_args() -> argparse.Namespace:
         "--http_timeout", type=float, default=5.0,
         help="number of seconds to wait on all network operations before raising a timeout error",
     )
+    parser.add_argument(
+        "--max_retries", type=int, default=3,
+        help="maximum number of times to retry a request after a transient failure, "
+        "i.e. a timeout, network error, 429, or 5xx error",
+    )
+    parser.add_argument(
+        "--backoff_base", type=float, default=1.0,
+        help="base number of seconds to wait between retries, doubled per consecutive "
+        "failure on a host, from which a random delay is drawn",
+    )
+    parser.add_argument(
+        "--backoff_max", type=float, default=30.0,
+        help="maximum number of seconds to wait between retries",
+    )
+    parser.add_argument(
+        "--failure_threshold", type=int, default=5,
+        help="number of consecutive failed requests to a host after which "
+        "its remaining pages are deferred until `cooldown` is over; then a trial request "
+        "is sent, and if it fails, the host's remaining pages are skipped",
+    )
+    parser.add_argument(
+        "--cooldown", type=float, default=300.0,
+        help="number of seconds to stop sending requests to a failing host "
+        "before trying it again",
+    )
+    parser.add_argument(
+        "--max_deferral_wait", type=float, default=300.0,
+        help="maximum number of seconds to wait for a failing host to accept requests "
+        "again once only deferred pages are left; pages whose host stays unavailable "
+        "for longer are skipped",
+    )
+    parser.add_argument(
+        "--cache_dirpath",
+        type=pathlib.Path,
+        default=PKG_ROOT.parents[1].joinpath(".cache", "metadata"),
+        help="path to directory on disk where raw structured metadata extracted from "
+        "HTML is cached, so that re-extracting data from the same HTML skips parsing",
+    )
+    parser.add_argument(
+        "--cache_max_nbytes", type=int, default=2 * 1024 ** 3,
+        help="maximum size of the metadata cache in bytes, beyond which "
+        "least-recently-used entries are evicted",
+    )
     parser.add_argument(
         "--force", action="store_true", default=False,
         help="if specified, save HTML and meta data under `data_dirpath` even if files "
@@ -80,21 +179,25 @@ def add_and_parse_args() -> argparse.Namespace:
     args = parser.parse_args()
     args.pages_fpath = args.pages_fpath.resolve()
     args.data_dirpath = args.data_dirpath.resolve()
+    args.cache_dirpath = args.cache_dirpath.resolve()
     return args
 
 
 def get_page_html_and_meta_data(
     url: str,
     client: Optional[httpx.Client] = None,
+    metadata_cache: Optional[dd.cache.MetadataCache] = None,
+    host_tracker: Optional[dd.hosts.HostTracker] = None,
     **kwargs,
 ) -> Optional[Tuple[str, Dict[str, Any]]]:
+    get_html = dd.html.get_html if host_tracker is None else host_tracker.get_html
     try:
-        html, response = dd.html.get_html(url, client=client, **kwargs)
+        html, response = get_html(url, client=client, **kwargs)
     except httpx.HTTPError:
         logging.exception("unable to get HTML for %s", url)
         return
     try:
-        meta = dd.html.get_data_from_html(html)
+        meta = dd.html.get_data_from_html(html, metadata_cache=metadata_cache)
     except Exception:
         logging.error("unable to extract data from HTML for %s", url)
         return
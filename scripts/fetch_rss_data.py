@@ -14,7 +14,7 @@ PKG_ROOT = dd.utils.get_pkg_root()
 def main():
     args = add_and_parse_args()
     pages = []
-    feeds = filter_feeds(dd.utils.load_rss_feeds(), args.only_feeds)
+    feeds = filter_feeds(dd.utils.load_rss_feeds(args.feeds_fpath), args.only_feeds)
     for feed in feeds:
         entries = dd.rss.get_entries_from_feed(feed, maxn=args.maxn_pages_per_feed)
         pages.extend(
@@ -47,6 +47,12 @@ def add_and_parse_args() -> argparse.Namespace:
         default=PKG_ROOT.parents[1].joinpath("data", "rss_pages.toml"),
         help="path to file on disk where pages fetched from RSS feeds are to be stored",
     )
+    parser.add_argument(
+        "--feeds_fpath",
+        type=pathlib.Path,
+        default=PKG_ROOT.parents[1].joinpath("data", "rss_feeds.toml"),
+        help="path to file on disk where the collection of RSS feeds is stored",
+    )
     parser.add_argument(
         "--only_feeds",
         type=str,
@@ -68,6 +74,7 @@ def add_and_parse_args() -> argparse.Namespace:
         "in that location; otherwise, just log a preview to the console"
     )
     args = parser.parse_args()
+    args.feeds_fpath = args.feeds_fpath.resolve()
     args.pages_fpath = args.pages_fpath.resolve()
     return args
 
@@ -0,0 +1,428 @@
+import argparse
+import datetime
+import email.utils
+import http.server
+import json
+import logging
+import pathlib
+import random
+import resource
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+import dragnet_data as dd
+
+logging.basicConfig(level=logging.INFO)
+
+SCRIPTS_DIRPATH = pathlib.Path(__file__).resolve().parent
+PARAGRAPH = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud "
+    "exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat."
+)
+
+
+def main():
+    args = add_and_parse_args()
+    rng = random.Random(args.seed)
+    slow_host_idxs = set(
+        rng.sample(range(args.n_hosts), min(args.n_slow_hosts, args.n_hosts))
+    )
+    servers = [
+        start_synthetic_host(
+            name=f"Host {idx:03d}",
+            n_pages=args.n_pages_per_host,
+            latency=args.slow_latency if idx in slow_host_idxs else args.latency,
+            error_rate=args.error_rate,
+            large_body_rate=args.large_body_rate,
+            large_body_nbytes=args.large_body_nbytes,
+            seed=args.seed + idx,
+        )
+        for idx in range(args.n_hosts)
+    ]
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report = run_load_test(args, servers, pathlib.Path(tmpdir))
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+    report["config"] = {
+        key: str(val) if isinstance(val, pathlib.Path) else val
+        for key, val in vars(args).items()
+    }
+    print_report(report)
+    if args.report_fpath:
+        dd.utils.save_json_data(report, args.report_fpath)
+
+
+def add_and_parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Load-test the end-to-end fetch pipeline -- `fetch_rss_data.py` "
+        "followed by `fetch_html_data.py` -- against local stand-in HTTP servers "
+        "that serve synthetic RSS feeds and article pages, then report throughput, "
+        "tail latency, and CPU usage.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--n_hosts", type=int, default=10,
+        help="number of synthetic hosts to serve, each on its own local port "
+        "with its own RSS feed",
+    )
+    parser.add_argument(
+        "--n_pages_per_host", type=int, default=25,
+        help="number of article pages listed in each host's RSS feed",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05,
+        help="mean number of seconds that hosts wait before responding to a request, "
+        "drawn from an exponential distribution",
+    )
+    parser.add_argument(
+        "--n_slow_hosts", type=int, default=1,
+        help="number of hosts that respond with `slow_latency` instead of `latency`",
+    )
+    parser.add_argument(
+        "--slow_latency", type=float, default=1.0,
+        help="mean number of seconds that slow hosts wait before responding to a request",
+    )
+    parser.add_argument(
+        "--error_rate", type=float, default=0.05,
+        help="fraction of article requests to which hosts respond with a 5xx or 429 error",
+    )
+    parser.add_argument(
+        "--large_body_rate", type=float, default=0.05,
+        help="fraction of article pages whose HTML is padded out to `large_body_nbytes`",
+    )
+    parser.add_argument(
+        "--large_body_nbytes", type=int, default=2 * 1024 ** 2,
+        help="approximate size in bytes of large article pages",
+    )
+    parser.add_argument(
+        "--http_timeout", type=float, default=5.0,
+        help="number of seconds to wait on all network operations before raising "
+        "a timeout error, as passed to `fetch_html_data.py`",
+    )
+    parser.add_argument(
+        "--fetch_html_args", type=str, nargs=argparse.REMAINDER, default=[],
+        help="additional arguments passed as-is to `fetch_html_data.py`, "
+        "e.g. `--fetch_html_args --max_retries 1 --backoff_max 5`",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42,
+        help="seed for random number generators, so that runs are reproducible",
+    )
+    parser.add_argument(
+        "--report_fpath", type=pathlib.Path,
+        help="if specified, path to file on disk where the report is saved as JSON",
+    )
+    args = parser.parse_args()
+    if args.report_fpath:
+        args.report_fpath = args.report_fpath.resolve()
+    return args
+
+
+class _SyntheticHostServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, name: str, config: Dict[str, Any]):
+        super().__init__(("127.0.0.1", 0), _SyntheticHostHandler)
+        self.name = name
+        self.config = config
+        self.url = f"http://127.0.0.1:{self.server_port}"
+        self.rng = random.Random(config["seed"])
+        self.rng_lock = threading.Lock()
+        # (path, start time, end time, status code) of each request handled
+        self.requests: List[Tuple[str, float, float, int]] = []
+
+    def random(self) -> float:
+        with self.rng_lock:
+            return self.rng.random()
+
+    def sample_latency(self) -> float:
+        """Draw a response latency from an exponential distribution around its mean."""
+        if self.config["latency"] <= 0.0:
+            return 0.0
+        with self.rng_lock:
+            return self.rng.expovariate(1.0 / self.config["latency"])
+
+
+class _SyntheticHostHandler(http.server.BaseHTTPRequestHandler):
+    server: _SyntheticHostServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        start = time.perf_counter()
+        config = self.server.config
+        time.sleep(self.server.sample_latency())
+        if self.path == "/feed.xml":
+            status_code = 200
+            self._send_body(status_code, "application/rss+xml", make_rss_feed(self.server))
+        elif self.path.startswith("/articles/"):
+            page_idx = self.path[len("/articles/"):]
+            if not page_idx.isdigit() or int(page_idx) >= config["n_pages"]:
+                status_code = 404
+                self._send_body(status_code, "text/plain", b"not found")
+            elif self.server.random() < config["error_rate"]:
+                status_code = 429 if self.server.random() < 0.25 else 503
+                self.send_response(status_code)
+                self.send_header("retry-after", "1")
+                self.send_header("content-length", "0")
+                self.end_headers()
+            else:
+                status_code = 200
+                nbytes = (
+                    config["large_body_nbytes"]
+                    if self.server.random() < config["large_body_rate"] else 0
+                )
+                html = make_article_html(self.server, int(page_idx), nbytes)
+                self._send_body(status_code, "text/html; charset=utf-8", html)
+        else:
+            status_code = 404
+            self._send_body(status_code, "text/plain", b"not found")
+        self.server.requests.append((self.path, start, time.perf_counter(), status_code))
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_body(self, status_code: int, content_type: str, body: bytes):
+        self.send_response(status_code)
+        self.send_header("content-type", content_type)
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_synthetic_host(
+    *,
+    name: str,
+    n_pages: int,
+    latency: float,
+    error_rate: float,
+    large_body_rate: float,
+    large_body_nbytes: int,
+    seed: int,
+) -> _SyntheticHostServer:
+    """Start a synthetic host's server in a background thread, and return it."""
+    server = _SyntheticHostServer(
+        name,
+        {
+            "n_pages": n_pages,
+            "latency": latency,
+            "error_rate": error_rate,
+            "large_body_rate": large_body_rate,
+            "large_body_nbytes": large_body_nbytes,
+            "seed": seed,
+        },
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def make_rss_feed(server: _SyntheticHostServer) -> bytes:
+    now = time.time()
+    items = "".join(
+        f"<item><title>{server.name} article {idx}</title>"
+        f"<link>{server.url}/articles/{idx}</link>"
+        f"<pubDate>{email.utils.formatdate(now - 3600 * idx, usegmt=True)}</pubDate>"
+        "</item>"
+        for idx in range(server.config["n_pages"])
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>{server.name}</title><link>{server.url}</link>{items}"
+        "</channel></rss>"
+    ).encode("utf-8")
+
+
+def make_article_html(server: _SyntheticHostServer, page_idx: int, nbytes: int) -> bytes:
+    """
+    Make a synthetic article page whose metadata is embedded as JSON-LD
+    or microdata, alternating by page, with its body padded out to ``nbytes``.
+    """
+    url = f"{server.url}/articles/{page_idx}"
+    title = f"{server.name} article {page_idx}"
+    dt_published = datetime.datetime.fromtimestamp(
+        time.time() - 3600 * page_idx, tz=datetime.timezone.utc,
+    ).isoformat()
+    n_paras = max(5, nbytes // (len(PARAGRAPH) + 7))
+    paras = [f"{PARAGRAPH} ({page_idx}.{idx})" for idx in range(n_paras)]
+    body = "".join(f"<p>{para}</p>" for para in paras)
+    if page_idx % 2 == 0:
+        jsonld = {
+            "@context": "https://schema.org",
+            "@type": "NewsArticle",
+            "url": url,
+            "headline": title,
+            "datePublished": dt_published,
+            "articleBody": "\n\n".join(paras),
+        }
+        head = f'<script type="application/ld+json">{json.dumps(jsonld)}</script>'
+        article = f"<article><h1>{title}</h1>{body}</article>"
+    else:
+        head = ""
+        article = (
+            '<article itemscope itemtype="https://schema.org/BlogPosting">'
+            f'<link itemprop="url" href="{url}"/>'
+            f'<h1 itemprop="headline">{title}</h1>'
+            f'<meta itemprop="datePublished" content="{dt_published}"/>'
+            f'<div itemprop="articleBody">{body}</div>'
+            "</article>"
+        )
+    return (
+        f"<!DOCTYPE html><html><head><title>{title}</title>{head}</head>"
+        f"<body><nav>home | news | about</nav>{article}<footer>(c) {server.name}</footer>"
+        "</body></html>"
+    ).encode("utf-8")
+
+
+def run_load_test(
+    args: argparse.Namespace,
+    servers: List[_SyntheticHostServer],
+    tmp_dirpath: pathlib.Path,
+) -> Dict[str, Any]:
+    feeds_fpath = tmp_dirpath.joinpath("rss_feeds.toml")
+    pages_fpath = tmp_dirpath.joinpath("rss_pages.toml")
+    data_dirpath = tmp_dirpath.joinpath("data")
+    feeds = [{"name": server.name, "url": f"{server.url}/feed.xml"} for server in servers]
+    dd.utils.save_toml_data({"feeds": feeds}, feeds_fpath)
+    report: Dict[str, Any] = {"stages": {}}
+    report["stages"]["fetch_rss_data"] = run_stage(
+        [
+            "fetch_rss_data.py",
+            "--feeds_fpath", str(feeds_fpath),
+            "--pages_fpath", str(pages_fpath),
+            "--maxn_pages_per_feed", str(args.n_pages_per_host),
+            "--force",
+        ],
+        servers,
+        n_items=len(servers),
+        unit="feeds",
+    )
+    n_pages = len(dd.utils.load_rss_pages(pages_fpath))
+    report["stages"]["fetch_html_data"] = run_stage(
+        [
+            "fetch_html_data.py",
+            "--pages_fpath", str(pages_fpath),
+            "--data_dirpath", str(data_dirpath),
+            "--cache_dirpath", str(tmp_dirpath.joinpath("cache")),
+            "--http_timeout", str(args.http_timeout),
+            "--force",
+        ] + args.fetch_html_args,
+        servers,
+        n_items=n_pages,
+        unit="pages",
+    )
+    report["n_pages_listed"] = n_pages
+    report["n_pages_saved"] = len(list(data_dirpath.joinpath("html").glob("*.html")))
+    return report
+
+
+def run_stage(
+    script_args: List[str],
+    servers: List[_SyntheticHostServer],
+    *,
+    n_items: int,
+    unit: str,
+) -> Dict[str, Any]:
+    """
+    Run a fetch script in a subprocess, and measure its wall-clock time and CPU usage,
+    plus latencies and status codes of all requests that it made to ``servers``.
+
+    Request latencies only cover time spent in servers' handlers, whereas page
+    latencies span from the first request for a url that a server sees to the end of
+    its final response, so they include client-side retries, backoff, deferrals, and
+    timeouts in between -- but not any backoff the client waits out before that first
+    request (e.g. after an earlier failure on the same host).
+    """
+    for server in servers:
+        server.requests.clear()
+    rusage_start = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(SCRIPTS_DIRPATH.joinpath(script_args[0]))] + script_args[1:],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    wall_time = time.perf_counter() - start
+    rusage_end = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu_time = (
+        (rusage_end.ru_utime - rusage_start.ru_utime)
+        + (rusage_end.ru_stime - rusage_start.ru_stime)
+    )
+    request_latencies = []
+    page_spans: Dict[str, Tuple[float, float]] = {}
+    status_codes: Dict[str, int] = {}
+    for server in servers:
+        for path, req_start, req_end, status_code in server.requests:
+            request_latencies.append(req_end - req_start)
+            status_codes[str(status_code)] = status_codes.get(str(status_code), 0) + 1
+            url = f"{server.url}{path}"
+            if url in page_spans:
+                first_start, last_end = page_spans[url]
+                page_spans[url] = (min(first_start, req_start), max(last_end, req_end))
+            else:
+                page_spans[url] = (req_start, req_end)
+    request_latencies.sort()
+    page_latencies = sorted(end - start for start, end in page_spans.values())
+    return {
+        "wall_time": wall_time,
+        "cpu_time": cpu_time,
+        "cpu_utilization": cpu_time / wall_time,
+        "unit": unit,
+        "n_items": n_items,
+        "items_per_sec": n_items / wall_time,
+        "n_requests": len(request_latencies),
+        "requests_per_sec": len(request_latencies) / wall_time,
+        "page_latency_percentiles": _get_percentiles(page_latencies),
+        "request_latency_percentiles": _get_percentiles(request_latencies),
+        "status_codes": status_codes,
+    }
+
+
+def _get_percentiles(values: List[float]) -> Dict[str, float]:
+    return {f"p{pct}": _get_percentile(values, pct) for pct in (50, 90, 99, 100)}
+
+
+def _get_percentile(values: List[float], pct: float) -> float:
+    """Get the ``pct``-th percentile of sorted ``values``, via the nearest-rank method."""
+    if not values:
+        return float("nan")
+    idx = max(0, min(len(values) - 1, int(round(pct / 100 * len(values))) - 1))
+    return values[idx]
+
+
+def print_report(report: Dict[str, Any]):
+    print(
+        f"saved {report['n_pages_saved']} / {report['n_pages_listed']} pages "
+        "listed in synthetic RSS feeds"
+    )
+    for name, stage in report["stages"].items():
+        page_latencies, request_latencies = (
+            ", ".join(f"{key}={val * 1000:.0f}ms" for key, val in percentiles.items())
+            for percentiles in (
+                stage["page_latency_percentiles"], stage["request_latency_percentiles"],
+            )
+        )
+        print(
+            f"{name}:\n"
+            f"  wall time: {stage['wall_time']:.2f}s, "
+            f"{stage['items_per_sec']:.2f} {stage['unit']}/s, "
+            f"{stage['requests_per_sec']:.2f} requests/s\n"
+            f"  cpu time: {stage['cpu_time']:.2f}s "
+            f"({stage['cpu_utilization']:.0%} of wall time)\n"
+            f"  page latency (end-to-end): {page_latencies}\n"
+            f"  request latency (server-side): {request_latencies}\n"
+            f"  status codes: {stage['status_codes']}"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
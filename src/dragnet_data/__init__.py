@@ -1,3 +1,5 @@
+from . import cache
+from . import hosts
 from . import html
 from . import rss
 from . import utils
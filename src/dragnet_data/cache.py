@@ -0,0 +1,109 @@
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import tempfile
+from typing import Any, Optional, Union
+
+from . import utils
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class MetadataCache:
+    """
+    Content-addressed, on-disk cache of raw structured metadata extracted from HTML,
+    so that downstream field cleaning can be re-run without re-parsing pages.
+
+    Entries are stored as JSON files under ``dirpath``, keyed by a hash of the HTML
+    and the version of the extractor that produced them. Once the cache grows past
+    ``max_nbytes``, its least-recently-used entries are evicted until it's back down
+    to 90% of that size.
+
+    Args:
+        dirpath: Path to directory on disk where cached entries are to be stored.
+        max_nbytes: Maximum total size of cached entries, in bytes.
+    """
+
+    def __init__(
+        self, dirpath: Union[str, pathlib.Path], *, max_nbytes: int = 2 * 1024 ** 3,
+    ):
+        self.dirpath = utils.to_path(dirpath).resolve()
+        self.dirpath.mkdir(parents=True, exist_ok=True)
+        self.max_nbytes = max_nbytes
+        self.nbytes = sum(fpath.stat().st_size for fpath in self._iter_entry_fpaths())
+        self.n_hits = 0
+        self.n_misses = 0
+
+    @staticmethod
+    def make_key(html: str, version: str) -> str:
+        """Make a cache key from the SHA-256 hash of ``html`` and extractor ``version``."""
+        hasher = hashlib.sha256(version.encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(html.encode("utf-8", errors="surrogatepass"))
+        return hasher.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get the data cached under ``key``, or None if there isn't any."""
+        fpath = self._get_entry_fpath(key)
+        try:
+            with fpath.open(mode="rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self.n_misses += 1
+            return None
+        except ValueError:
+            LOGGER.warning("cache entry at %s is corrupt; removing it", fpath)
+            self._remove_entry(fpath)
+            self.n_misses += 1
+            return None
+        # bump entry's mtime, which serves as its "last used" time for eviction
+        os.utime(fpath)
+        self.n_hits += 1
+        return data
+
+    def set(self, key: str, data: Any):
+        """Cache JSON-serializable ``data`` under ``key``, evicting old entries if needed."""
+        fpath = self._get_entry_fpath(key)
+        fpath.parent.mkdir(exist_ok=True)
+        if fpath.exists():
+            self.nbytes -= fpath.stat().st_size
+        # write to a temp file then rename, so readers never see a partial entry
+        fd, tmp_fpath = tempfile.mkstemp(dir=str(fpath.parent), suffix=".tmp")
+        with os.fdopen(fd, mode="wt", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_fpath, str(fpath))
+        self.nbytes += fpath.stat().st_size
+        if self.nbytes > self.max_nbytes:
+            self.evict(int(0.9 * self.max_nbytes))
+
+    def evict(self, max_nbytes: int):
+        """Remove least-recently-used entries until cache is at most ``max_nbytes``."""
+        entries = sorted(
+            ((fpath, fpath.stat()) for fpath in self._iter_entry_fpaths()),
+            key=lambda item: item[1].st_mtime,
+        )
+        n_evicted = 0
+        for fpath, stat in entries:
+            if self.nbytes <= max_nbytes:
+                break
+            self._remove_entry(fpath, stat.st_size)
+            n_evicted += 1
+        LOGGER.info("evicted %s entries from metadata cache at %s", n_evicted, self.dirpath)
+
+    def _get_entry_fpath(self, key: str) -> pathlib.Path:
+        return self.dirpath.joinpath(key[:2], f"{key}.json")
+
+    def _iter_entry_fpaths(self):
+        return self.dirpath.glob("*/*.json")
+
+    def _remove_entry(self, fpath: pathlib.Path, nbytes: Optional[int] = None):
+        try:
+            if nbytes is None:
+                nbytes = fpath.stat().st_size
+            fpath.unlink()
+        except FileNotFoundError:
+            return
+        self.nbytes -= nbytes
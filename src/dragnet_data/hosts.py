@@ -0,0 +1,220 @@
+import collections
+import email.utils
+import logging
+import random
+import time
+import urllib.parse
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from . import html
+
+
+LOGGER = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+class HostUnavailableError(Exception):
+    """
+    Raised when a request to a host is refused without being sent, because the host's
+    circuit breaker is open. ``retry_at`` gives the :func:`time.monotonic()` time at
+    which the host will accept requests again.
+    """
+
+    def __init__(self, host: str, retry_at: float):
+        super().__init__(
+            f"host={host} is unavailable for the next {retry_at - time.monotonic():.1f}s"
+        )
+        self.host = host
+        self.retry_at = retry_at
+
+
+class _HostState:
+    def __init__(self):
+        self.n_successes = 0
+        self.n_errors = 0
+        self.n_failures = 0
+        self.n_retries = 0
+        self.n_skipped = 0
+        self.n_consecutive_failures = 0
+        self.next_attempt_at = 0.0
+        self.open_until = 0.0
+
+
+class HostTracker:
+    """
+    Track request outcomes per host, so that fetching HTML can retry transient
+    failures (timeouts, network errors, 429s and 5xx errors) with jittered exponential
+    backoff, honor servers' ``Retry-After`` headers, and stop sending requests
+    to hosts that appear to be down.
+
+    After ``failure_threshold`` consecutive failures, a host's circuit breaker "opens"
+    and requests to it raise :class:`HostUnavailableError` without being sent
+    for ``cooldown`` seconds; after that, a single trial request is let through,
+    and the circuit closes again only if it succeeds.
+
+    Args:
+        max_retries: Maximum number of times to retry a request after a transient failure.
+        backoff_base: Base delay in seconds between retries, doubled per consecutive
+            failure, from which a random delay is drawn ("full jitter").
+        backoff_max: Maximum delay in seconds between retries. If a ``Retry-After``
+            header asks for a longer wait, the host's circuit is opened instead.
+        failure_threshold: Number of consecutive failures after which a host's
+            circuit breaker opens.
+        cooldown: Number of seconds for which an open circuit refuses requests.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        failure_threshold: int = 5,
+        cooldown: float = 300.0,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._states: Dict[str, _HostState] = collections.defaultdict(_HostState)
+
+    def get_html(
+        self, url: str, client: Optional[httpx.Client] = None, **kwargs,
+    ) -> Tuple[str, httpx.Response]:
+        """
+        Get HTML from ``url`` via :func:`dragnet_data.html.get_html()`,
+        retrying transient failures and respecting the state of the url's host.
+
+        Raises:
+            :class:`HostUnavailableError`: If the host's circuit breaker is open.
+            :class:`httpx.HTTPError`: If the request failed for good.
+        """
+        host = get_host(url)
+        state = self._states[host]
+        error: httpx.HTTPError
+        for n_attempts in range(self.max_retries + 1):
+            now = time.monotonic()
+            if now < state.open_until:
+                raise HostUnavailableError(host, state.open_until)
+            if now < state.next_attempt_at:
+                time.sleep(state.next_attempt_at - now)
+            if n_attempts > 0:
+                state.n_retries += 1
+            try:
+                return_value = html.get_html(url, client=client, **kwargs)
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code not in RETRYABLE_STATUS_CODES:
+                    # host is up, it just can't give us this particular page
+                    state.n_errors += 1
+                    state.n_consecutive_failures = 0
+                    raise
+                error = exc
+                retry_after = get_retry_after(exc.response)
+            except RETRYABLE_ERRORS as exc:
+                error = exc
+                retry_after = None
+            except httpx.HTTPError:
+                # e.g. invalid url, unsupported protocol, too many redirects:
+                # retrying won't help, and it says nothing about the host's health
+                state.n_errors += 1
+                raise
+            else:
+                state.n_successes += 1
+                state.n_consecutive_failures = 0
+                return return_value
+            self._record_failure(host, state, retry_after)
+            LOGGER.warning(
+                "attempt %s / %s to get %s failed: %r",
+                n_attempts + 1, self.max_retries + 1, url, error,
+            )
+        raise error
+
+    def record_skipped(self, url: str):
+        """
+        Record that the caller gave up on ``url`` for good, because its host was
+        unavailable. Callers should do so once per url, however many times
+        :meth:`get_html()` raised :class:`HostUnavailableError` for it.
+        """
+        self._states[get_host(url)].n_skipped += 1
+
+    def get_report(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-host counts of request outcomes, plus whether its circuit is open."""
+        now = time.monotonic()
+        return {
+            host: {
+                "n_successes": state.n_successes,
+                "n_errors": state.n_errors,
+                "n_failures": state.n_failures,
+                "n_retries": state.n_retries,
+                "n_skipped": state.n_skipped,
+                "circuit_open": now < state.open_until,
+            }
+            for host, state in sorted(self._states.items())
+        }
+
+    def log_report(self):
+        """Log a summary of request outcomes for hosts that had any trouble."""
+        report = self.get_report()
+        n_hosts_ok = 0
+        for host, outcomes in report.items():
+            if outcomes["n_failures"] or outcomes["n_errors"] or outcomes["n_skipped"]:
+                LOGGER.info(
+                    "host=%s: %s",
+                    host, ", ".join(f"{key}={val}" for key, val in outcomes.items()),
+                )
+            else:
+                n_hosts_ok += 1
+        LOGGER.info("%s / %s hosts had no failed requests", n_hosts_ok, len(report))
+
+    def _record_failure(self, host: str, state: _HostState, retry_after: Optional[float]):
+        state.n_failures += 1
+        state.n_consecutive_failures += 1
+        now = time.monotonic()
+        max_delay = self.backoff_base * 2 ** (state.n_consecutive_failures - 1)
+        delay = random.uniform(0.0, min(self.backoff_max, max_delay))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        state.next_attempt_at = now + delay
+        if state.n_consecutive_failures >= self.failure_threshold:
+            state.open_until = now + max(self.cooldown, delay)
+            LOGGER.warning(
+                "host=%s failed %s times in a row; refusing requests to it for %.1fs",
+                host, state.n_consecutive_failures, state.open_until - now,
+            )
+        elif delay > self.backoff_max:
+            state.open_until = state.next_attempt_at
+            LOGGER.warning(
+                "host=%s asked to retry after %.1fs; refusing requests to it until then",
+                host, delay,
+            )
+
+
+def get_host(url: str) -> str:
+    """Get the (lowercased) host name of ``url``, including its port, if specified."""
+    parsed_url = urllib.parse.urlparse(url)
+    host = (parsed_url.hostname or "").lower()
+    return f"{host}:{parsed_url.port}" if parsed_url.port else host
+
+
+def get_retry_after(response: httpx.Response) -> Optional[float]:
+    """
+    Get the number of seconds to wait before retrying a request, as given by the
+    ``Retry-After`` header of ``response`` in delay-seconds or HTTP-date form, if any.
+    """
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        dt = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        LOGGER.warning("unable to parse Retry-After=%s", value)
+        return None
+    return max(0.0, dt.timestamp() - time.time())
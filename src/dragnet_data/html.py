@@ -7,6 +7,8 @@ import extruct
 import ftfy
 import httpx
 
+from . import cache
+
 
 LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +30,21 @@ PAGE_TYPES = {"WebPage",}
 METADATA_SYNTAXES = {"microdata", "json-ld"}
 
 
+def _get_extruct_version() -> str:
+    try:
+        from importlib.metadata import version
+    except ImportError:  # python < 3.8
+        import pkg_resources
+        return pkg_resources.get_distribution("extruct").version
+    return version("extruct")
+
+
+# bump the suffix whenever raw metadata extraction changes, to invalidate cached outputs
+EXTRACTOR_VERSION = "extruct-{}:{}:1".format(
+    _get_extruct_version(), ",".join(sorted(METADATA_SYNTAXES)),
+)
+
+
 def get_html(
     url: str,
     client: Optional[httpx.Client] = None,
@@ -42,9 +59,44 @@ def get_html(
     return html, response
 
 
-def get_data_from_html(html: str) -> Dict[str, Any]:
+def get_data_from_html(
+    html: str, *, metadata_cache: Optional[cache.MetadataCache] = None,
+) -> Dict[str, Any]:
+    """
+    Extract structured metadata from ``html``, then get cleaned key data from it.
+    If ``metadata_cache`` is given, raw metadata is looked up there before parsing.
+
+    See Also:
+        - :func:`get_metadata_from_html()`
+        - :func:`get_data_from_metadata()`
+    """
+    if metadata_cache is None:
+        metadata = get_metadata_from_html(html)
+    else:
+        key = metadata_cache.make_key(html, EXTRACTOR_VERSION)
+        cached = metadata_cache.get(key)
+        if cached is None:
+            metadata = get_metadata_from_html(html)
+            metadata_cache.set(key, metadata)
+        else:
+            metadata = cached
+    return get_data_from_metadata(metadata)
+
+
+def get_metadata_from_html(html: str) -> Dict[str, List[dict]]:
+    """
+    Extract raw, uniform JSON-LD and microdata items from ``html``, keyed by syntax.
+    This is the slow part of extraction, and its outputs are safe to cache.
+    """
+    return extruct.extract(html, syntaxes=sorted(METADATA_SYNTAXES), uniform=True)
+
+
+def get_data_from_metadata(metadata: Dict[str, List[dict]]) -> Dict[str, Any]:
+    """
+    Get key data ('url', 'title', 'dt_published', 'text') from article items
+    in raw structured ``metadata``, as output by :func:`get_metadata_from_html()`.
+    """
     data = {}
-    metadata = extruct.extract(html, syntaxes=list(METADATA_SYNTAXES), uniform=True)
     for syntax in METADATA_SYNTAXES:
         for jsonld in metadata[syntax]:
             _check_context(jsonld)
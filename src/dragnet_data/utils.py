@@ -1,12 +1,19 @@
+import collections
+import concurrent.futures
 import datetime
 import importlib
+import io
 import json
 import logging
+import os
 import pathlib
 import random
 import shutil
+import struct
+import tarfile
 import uuid
-from typing import Any, Dict, List, Optional, Union
+import zlib
+from typing import Any, BinaryIO, Deque, Dict, Iterator, List, Optional, Tuple, Union
 
 import toml
 
@@ -14,6 +21,10 @@ import toml
 LOGGER = logging.getLogger(__name__)
 DATA_DIRNAMES = ("html", "meta")
 META_FIELDS = ("id", "url", "title", "dt_published", "text")
+GZIP_CHUNK_SIZE = 4 * 1024 * 1024
+
+_GZIP_FLAG_FEXTRA = 0x04
+_GZIP_EXTRA_SUBFIELD_ID = b"DD"
 
 
 def get_random_sample(items: List[Any], k: int) -> List[Any]:
@@ -37,14 +48,17 @@ def get_pkg_root() -> Optional[pathlib.Path]:
         return None
 
 
-def load_rss_feeds() -> List[Dict[str, Any]]:
+def load_rss_feeds(
+    fpath: Optional[Union[str, pathlib.Path]] = None,
+) -> List[Dict[str, Any]]:
     """
     Load a curated collection of RSS feeds from which recent pages may be fetched,
-    as stored in ``/path/to/dragnet_data/data/rss_feeds.toml``.
+    as stored in ``/path/to/dragnet_data/data/rss_feeds.toml`` -- or, if specified,
+    an alternative collection stored in the same format at ``fpath``.
     """
-    pkg_root = get_pkg_root()
-    feeds_fpath = pkg_root.parents[1].joinpath("data", "rss_feeds.toml")
-    feeds = load_toml_data(feeds_fpath)["feeds"]
+    if fpath is None:
+        fpath = get_pkg_root().parents[1].joinpath("data", "rss_feeds.toml")
+    feeds = load_toml_data(fpath)["feeds"]
     return feeds
 
 
@@ -160,11 +174,244 @@ def unpack_gztar_archive_to_dir(fpath: pathlib.Path):
     Unpack contents of gzipped tar archive file at ``fpath`` into a subdirectory of the
     same base name within the same directory.
     """
-    extract_dir = fpath.parent.joinpath(fpath.name[:-len("".join(fpath.suffixes))])
+    extract_dir = _get_extract_dirpath(fpath)
     shutil.unpack_archive(fpath, extract_dir, format="gztar")
     LOGGER.info("unpacked gztar archive into %s", extract_dir)
 
 
+def make_gztar_archive_from_dir_parallel(
+    dirpath: pathlib.Path,
+    *,
+    n_workers: Optional[int] = None,
+    chunk_size: int = GZIP_CHUNK_SIZE,
+    compresslevel: int = 9,
+) -> pathlib.Path:
+    """
+    Make a gzipped tar archive from all contents of the directory at ``dirpath``,
+    and save to a file of the same base name with the parent directory --
+    just like :func:`make_gztar_archive_from_dir()`, only with the tar stream split
+    into chunks of ``chunk_size`` bytes that are compressed on a pool of
+    ``n_workers`` threads.
+
+    The output is a standard multi-member gzip file that ``tar``, ``gzip``,
+    and :func:`unpack_gztar_archive_to_dir()` can read as-is; each member also
+    records its compressed size in a gzip "extra" field, which lets
+    :func:`unpack_gztar_archive_to_dir_parallel()` decompress members in parallel.
+    """
+    dirpath = to_path(dirpath)
+    fpath = dirpath.parent.joinpath(f"{dirpath.name}.tar.gz")
+    # write to a temp file then rename, so a failure never clobbers an existing archive
+    tmp_fpath = fpath.with_name(f"{fpath.name}.tmp")
+    try:
+        with tmp_fpath.open(mode="wb") as f:
+            with _ParallelGzipWriter(f, n_workers, chunk_size, compresslevel) as gzf:
+                with tarfile.open(fileobj=gzf, mode="w|") as tar:
+                    tar.add(str(dirpath), arcname=os.curdir)
+        os.replace(str(tmp_fpath), str(fpath))
+    except BaseException:
+        if tmp_fpath.exists():
+            tmp_fpath.unlink()
+        raise
+    LOGGER.info("made gztar archive at %s", fpath)
+    return fpath
+
+
+def unpack_gztar_archive_to_dir_parallel(
+    fpath: pathlib.Path,
+    *,
+    n_workers: Optional[int] = None,
+):
+    """
+    Unpack contents of gzipped tar archive file at ``fpath`` into a subdirectory of the
+    same base name within the same directory, decompressing gzip members on a pool of
+    ``n_workers`` threads.
+
+    Archives that weren't made by :func:`make_gztar_archive_from_dir_parallel()`
+    can't be split up ahead of time, so they're unpacked serially via
+    :func:`unpack_gztar_archive_to_dir()` instead.
+    """
+    fpath = to_path(fpath)
+    with fpath.open(mode="rb") as f:
+        members = _index_gzip_members(f)
+        if members is None:
+            LOGGER.info("%s has no gzip member index; unpacking serially", fpath)
+        else:
+            extract_dir = _get_extract_dirpath(fpath)
+            gzf = _ParallelGzipReader(f, members, n_workers)
+            with tarfile.open(fileobj=gzf, mode="r|") as tar:
+                tar.extractall(str(extract_dir))
+            LOGGER.info("unpacked gztar archive into %s", extract_dir)
+            return
+    unpack_gztar_archive_to_dir(fpath)
+
+
+def _get_extract_dirpath(fpath: pathlib.Path) -> pathlib.Path:
+    return fpath.parent.joinpath(fpath.name[:-len("".join(fpath.suffixes))])
+
+
+def _compress_gzip_member(data: bytes, compresslevel: int) -> bytes:
+    """
+    Compress ``data`` into a single, self-contained gzip member (RFC 1952) whose
+    header includes an extra subfield recording the size of its deflate payload.
+    """
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    payload = compressor.compress(data) + compressor.flush()
+    extra = _GZIP_EXTRA_SUBFIELD_ID + struct.pack("<HI", 4, len(payload))
+    header = struct.pack(
+        "<BBBBIBBH", 0x1F, 0x8B, 8, _GZIP_FLAG_FEXTRA, 0, 0, 255, len(extra)
+    )
+    trailer = struct.pack("<II", zlib.crc32(data), len(data) & 0xFFFFFFFF)
+    return header + extra + payload + trailer
+
+
+def _decompress_gzip_member(payload: bytes, crc: int, size: int) -> bytes:
+    data = zlib.decompress(payload, -zlib.MAX_WBITS)
+    if zlib.crc32(data) != crc or len(data) & 0xFFFFFFFF != size:
+        raise ValueError("gzip member failed its CRC / size check; archive is corrupt")
+    return data
+
+
+def _index_gzip_members(f: BinaryIO) -> Optional[List[Tuple[int, int]]]:
+    """
+    Scan the headers of a multi-member gzip file written by
+    :func:`_compress_gzip_member()`, returning the (offset, size) of each member's
+    deflate payload; if the file's first member wasn't written that way, return None.
+    """
+    members: List[Tuple[int, int]] = []
+    f.seek(0)
+    while True:
+        header = f.read(12)
+        if not header:
+            break
+        if len(header) < 12:
+            raise ValueError("gzip file ends with a truncated member header")
+        magic1, magic2, method, flags, _, _, _, xlen = struct.unpack("<BBBBIBBH", header)
+        extra = f.read(xlen) if flags == _GZIP_FLAG_FEXTRA else b""
+        if (
+            (magic1, magic2, method) != (0x1F, 0x8B, 8)
+            or len(extra) != 10
+            or extra[:2] != _GZIP_EXTRA_SUBFIELD_ID
+        ):
+            if not members:
+                return None
+            raise ValueError(f"gzip member at offset {f.tell()} lacks a size index")
+        _, payload_size = struct.unpack("<HI", extra[2:])
+        members.append((f.tell(), payload_size))
+        f.seek(payload_size + 8, io.SEEK_CUR)
+    return members
+
+
+class _ParallelGzipWriter(io.RawIOBase):
+    """
+    Write-only file-like object that buffers data into fixed-size chunks, compresses
+    them into independent gzip members on a thread pool, and writes completed members
+    to ``fileobj`` in order. ``zlib`` releases the GIL while compressing, so threads
+    give real parallelism; at most ``2 * n_workers`` chunks are held in memory.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        n_workers: Optional[int],
+        chunk_size: int,
+        compresslevel: int,
+    ):
+        super().__init__()
+        self._fileobj = fileobj
+        self._chunk_size = chunk_size
+        self._compresslevel = compresslevel
+        self._buffer = bytearray()
+        n_workers = n_workers or os.cpu_count() or 1
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=n_workers)
+        self._max_pending = 2 * n_workers
+        self._pending: Deque[concurrent.futures.Future] = collections.deque()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer.extend(data)
+        while len(self._buffer) >= self._chunk_size:
+            chunk = bytes(self._buffer[:self._chunk_size])
+            del self._buffer[:self._chunk_size]
+            self._submit(chunk)
+        return len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self._fileobj.write(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown(wait=True)
+            super().close()
+
+    def _submit(self, chunk: bytes):
+        while len(self._pending) >= self._max_pending:
+            self._fileobj.write(self._pending.popleft().result())
+        self._pending.append(
+            self._executor.submit(_compress_gzip_member, chunk, self._compresslevel)
+        )
+
+
+class _ParallelGzipReader(io.RawIOBase):
+    """
+    Read-only, non-seekable file-like object that decompresses the indexed gzip
+    ``members`` of ``fileobj`` on a thread pool and serves their data in order,
+    holding at most ``2 * n_workers`` members in memory at a time.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        members: List[Tuple[int, int]],
+        n_workers: Optional[int],
+    ):
+        super().__init__()
+        self._chunks = self._iter_chunks(fileobj, members, n_workers)
+        self._chunk = b""
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while self._pos >= len(self._chunk):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._chunk = chunk
+            self._pos = 0
+        n = min(len(b), len(self._chunk) - self._pos)
+        b[:n] = self._chunk[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    @staticmethod
+    def _iter_chunks(
+        fileobj: BinaryIO, members: List[Tuple[int, int]], n_workers: Optional[int],
+    ) -> Iterator[bytes]:
+        n_workers = n_workers or os.cpu_count() or 1
+        max_pending = 2 * n_workers
+        with concurrent.futures.ThreadPoolExecutor(max_workers=n_workers) as executor:
+            pending: Deque[concurrent.futures.Future] = collections.deque()
+            for offset, payload_size in members:
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+                fileobj.seek(offset)
+                payload = fileobj.read(payload_size)
+                crc, size = struct.unpack("<II", fileobj.read(8))
+                pending.append(
+                    executor.submit(_decompress_gzip_member, payload, crc, size)
+                )
+            while pending:
+                yield pending.popleft().result()
+
+
 class ExtendedJSONEncoder(json.JSONEncoder):
     """
     Sub-class of :class:`json.JSONEncoder`, used to write JSON data to disk in